@@ -12,7 +12,9 @@ from bs4 import BeautifulSoup
 from time import sleep
 import numpy as np
 import os
+from src.metricas import medir, temporizador, contar, registrar_bytes, metricas_activas
 
+@medir("obtener_links")
 def obtener_links(receta):
     """Busca y devuelve el enlace de la receta más relevante en sitios específicos.
 
@@ -32,11 +34,16 @@ def obtener_links(receta):
         Exception: Para otros errores generales durante la ejecución del proceso.
     """
     
-    driver = webdriver.Chrome()
+    with temporizador("chrome_arranque"):
+        driver = webdriver.Chrome()
     query = urllib.parse.quote(f"{receta} site:allrecipes.com/recipe OR site:tasty.co/recipe")
     search_url = f"https://google.com/search?q={query}"
     # print(search_url)
-    driver.get(search_url)
+    with temporizador("google_busqueda"):
+        driver.get(search_url)
+    contar("google_busquedas")
+    if metricas_activas(): # page_source serializa el DOM, solo lo pedimos si se está midiendo
+        registrar_bytes("google", len(driver.page_source))
     try:
         element = driver.find_element(By.XPATH, "//*[text()='Rechazar todo']")
         element.click()
@@ -60,8 +67,10 @@ def obtener_links(receta):
 
     except Exception as e:
         print(e)
+        contar("google_sin_resultado")
         return None
     
+@medir("obtener_links_paralelos")
 def obtener_links_paralelos(recetas):
     """Obtiene enlaces de recetas en paralelo para una lista de recetas.
 
@@ -81,6 +90,7 @@ def obtener_links_paralelos(recetas):
                 urls.append(url)
             except Exception as e:
                 print(f"Error al obtener link para la receta '{receta}': {e}")
+                contar("obtener_links_errores")
                 urls.append(None)
 
     return urls
@@ -112,6 +122,7 @@ def clean_texts(texts):
     return cleaned_texts
 
     
+@medir("generate_results")
 def generate_results(search_term, datefrom=pd.to_datetime('2024')):
     """Genera un DataFrame con los videos más populares relacionados con un término de búsqueda.
 
@@ -134,17 +145,20 @@ def generate_results(search_term, datefrom=pd.to_datetime('2024')):
         Exception: Si ocurre algún error durante la obtención de resultados o el procesamiento de datos.
     """
 
-    search = Search(search_term)
-    for _ in range(4):
-        search.get_next_results()
+    with temporizador("youtube_busqueda"):
+        search = Search(search_term)
+        for _ in range(4):
+            search.get_next_results()
+    contar("youtube_videos", len(search.videos))
     dict_videos = dict(title = [], views = [], date = [])
     for video in tqdm(search.videos):
         if video.publish_date.replace(tzinfo=None) > datefrom and video.title not in dict_videos["title"]:
             dict_videos["title"].append(video.title)
             dict_videos["views"].append(video.views)
             dict_videos["date"].append(video.publish_date.replace(tzinfo=None))
-    df_videos = pd.DataFrame(dict_videos)
-    df_videos = df_videos.iloc[df_videos.sort_values('views', ascending=False)["title"].drop_duplicates().index]
+    with temporizador("pandas_resultados"):
+        df_videos = pd.DataFrame(dict_videos)
+        df_videos = df_videos.iloc[df_videos.sort_values('views', ascending=False)["title"].drop_duplicates().index]
     return df_videos
     
 def convert_fractions(ingredient_list):
@@ -200,6 +214,7 @@ def convert_fractions(ingredient_list):
         converted_ingredients.append(ingredient)
     return converted_ingredients
 
+@medir("tasty_ing")
 def tasty_ing(link):
     """Extrae información de ingredientes de una receta de Tasty.
 
@@ -222,7 +237,9 @@ def tasty_ing(link):
         requests.exceptions.RequestException: Si ocurre un error en la solicitud a la página.
         AttributeError: Si no se encuentran los elementos esperados en el HTML de la receta.
     """
-    response = requests.get(url = link)
+    with temporizador("tasty_descarga"):
+        response = requests.get(url = link)
+    registrar_bytes("tasty", len(response.content))
     soup = BeautifulSoup(response.content, 'html.parser')
     ingredient_col = soup.find('div', class_ = 'col md-col-4 xs-mx2 xs-pb3 md-mt0 xs-mt2')
     servings = ingredient_col.find('p').text
@@ -255,6 +272,7 @@ def tasty_ing(link):
     return df
 
     
+@medir("allrecipes_ing")
 def allrecipes_ing(link):
     """Extrae información de ingredientes de una receta en Allrecipes.
 
@@ -277,10 +295,14 @@ def allrecipes_ing(link):
         selenium.common.exceptions.WebDriverException: Si ocurre un error en la conexión o en el controlador.
         AttributeError: Si no se encuentran los elementos esperados en el HTML de la receta.
     """
-    driver = webdriver.Chrome()
-    driver.get(url = link)
-    sleep(2)
-    soup2 = BeautifulSoup(driver.page_source, 'html.parser')
+    with temporizador("chrome_arranque"):
+        driver = webdriver.Chrome()
+    with temporizador("allrecipes_descarga"):
+        driver.get(url = link)
+        sleep(2)
+        page_source = driver.page_source
+    registrar_bytes("allrecipes", len(page_source))
+    soup2 = BeautifulSoup(page_source, 'html.parser')
     driver.quit()
 
     ingredient_soup = soup2.find('div', class_ = 'comp mm-recipes-structured-ingredients')
@@ -325,6 +347,7 @@ def edamam_query(df):
     ingredientes_str = [" ".join(map(str, item)) for item in df.values]
     return ingredientes_str
 
+@medir("get_nutrients")
 def get_nutrients(ing_list, serving_size):
     """Obtiene datos nutricionales de una lista de ingredientes usando la API de EDAMAM.
 
@@ -362,8 +385,11 @@ def get_nutrients(ing_list, serving_size):
         
     }
 
-    response = requests.post(url, headers=headers, 
-            params={"app_id": os.getenv('edamam_session_id'), "app_key": os.getenv('edamam_api_key')}, json=data)
+    with temporizador("edamam_peticion"):
+        response = requests.post(url, headers=headers, 
+                params={"app_id": os.getenv('edamam_session_id'), "app_key": os.getenv('edamam_api_key')}, json=data)
+    registrar_bytes("edamam", len(response.content))
+    contar(f"edamam_status_{response.status_code}")
 
     if response.status_code == 200:
         nutrition_data = response.json()
@@ -372,6 +398,7 @@ def get_nutrients(ing_list, serving_size):
             try:
                  ingredient.get("parsed")[0] # Para aquellos ingredientes que la api no reconoce
             except:
+                contar("edamam_ingredientes_no_reconocidos")
                 continue
             ingredient_name = ingredient.get("parsed")[0].get("foodMatch")
             nutrients = ingredient.get("parsed")[0].get("nutrients")
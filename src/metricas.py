@@ -0,0 +1,290 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+
+# Límites (en segundos) de los buckets de los histogramas de latencia
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_estado = {
+    "activo": os.getenv("recetas_metricas", "0").lower() in ("1", "true", "si", "sí"),
+    "inicio": time.time(),
+}
+_contadores = {}
+_histogramas = {}
+_caches = {}
+
+
+def activar_metricas():
+    """Activa la recogida de métricas.
+
+    Returns:
+        None.
+    """
+    _estado["activo"] = True
+
+
+def desactivar_metricas():
+    """Desactiva la recogida de métricas. Las funciones instrumentadas pasan a ejecutarse sin medir nada.
+
+    Returns:
+        None.
+    """
+    _estado["activo"] = False
+
+
+def metricas_activas():
+    """Indica si la recogida de métricas está activada.
+
+    Returns:
+        bool: `True` si se están recogiendo métricas.
+    """
+    return _estado["activo"]
+
+
+def reiniciar_metricas():
+    """Borra todas las métricas acumuladas y marca el inicio de una nueva ejecución.
+
+    Returns:
+        None.
+    """
+    with _lock:
+        _contadores.clear()
+        _histogramas.clear()
+        _caches.clear()
+        _estado["inicio"] = time.time()
+
+
+def contar(nombre, valor=1):
+    """Incrementa un contador.
+
+    Args:
+        nombre (str): Nombre del contador (ej. "google_busquedas").
+        valor (int, opcional): Cantidad a sumar. Por defecto es 1.
+
+    Returns:
+        None.
+    """
+    if not _estado["activo"]:
+        return
+    with _lock:
+        _contadores[nombre] = _contadores.get(nombre, 0) + valor
+
+
+def registrar_bytes(origen, n_bytes):
+    """Suma los bytes descargados desde un origen (ej. "tasty", "edamam").
+
+    Args:
+        origen (str): Nombre del origen de los datos.
+        n_bytes (int): Número de bytes recibidos.
+
+    Returns:
+        None.
+    """
+    contar(f"bytes_{origen}", n_bytes)
+
+
+def registrar_cache(nombre, acierto):
+    """Registra un acceso a una caché para calcular su tasa de aciertos.
+
+    Args:
+        nombre (str): Nombre de la caché.
+        acierto (bool): `True` si el valor estaba en la caché, `False` en caso contrario.
+
+    Returns:
+        None.
+    """
+    if not _estado["activo"]:
+        return
+    with _lock:
+        cache = _caches.setdefault(nombre, {"aciertos": 0, "fallos": 0})
+        cache["aciertos" if acierto else "fallos"] += 1
+
+
+def observar(etapa, segundos):
+    """Añade una medida de latencia al histograma de una etapa.
+
+    Args:
+        etapa (str): Nombre de la etapa medida (ej. "get_nutrients").
+        segundos (float): Duración de la etapa en segundos.
+
+    Returns:
+        None.
+    """
+    if not _estado["activo"]:
+        return
+    with _lock:
+        hist = _histogramas.get(etapa)
+        if hist is None:
+            hist = _histogramas[etapa] = {
+                "buckets": [0] * (len(BUCKETS) + 1),
+                "count": 0,
+                "sum": 0.0,
+                "min": segundos,
+                "max": segundos,
+                "errores": 0,
+            }
+        hist["buckets"][bisect_left(BUCKETS, segundos)] += 1
+        hist["count"] += 1
+        hist["sum"] += segundos
+        hist["min"] = min(hist["min"], segundos)
+        hist["max"] = max(hist["max"], segundos)
+
+
+def _registrar_error(etapa):
+    with _lock:
+        if etapa in _histogramas:
+            _histogramas[etapa]["errores"] += 1
+
+
+@contextmanager
+def temporizador(etapa):
+    """Mide el tiempo que tarda un bloque de código y lo añade al histograma de la etapa.
+
+    Si el bloque lanza una excepción, la duración se registra igualmente y se cuenta como error.
+
+    Args:
+        etapa (str): Nombre de la etapa medida.
+
+    Example:
+        >>> with temporizador("chrome_arranque"):
+        ...     driver = webdriver.Chrome()
+    """
+    if not _estado["activo"]:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        observar(etapa, time.perf_counter() - inicio)
+        _registrar_error(etapa)
+        raise
+    observar(etapa, time.perf_counter() - inicio)
+
+
+def medir(etapa):
+    """Decorador que mide la duración de cada llamada a una función.
+
+    Cuando las métricas están desactivadas, la función se llama directamente sin
+    ningún trabajo adicional más allá de comprobar el estado.
+
+    Args:
+        etapa (str): Nombre con el que se registra la función en las métricas.
+
+    Returns:
+        function: Decorador que envuelve la función original.
+    """
+    def decorador(func):
+        @functools.wraps(func)
+        def envoltorio(*args, **kwargs):
+            if not _estado["activo"]:
+                return func(*args, **kwargs)
+            with temporizador(etapa):
+                return func(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+def resumen_metricas():
+    """Devuelve un resumen de todas las métricas de la ejecución actual.
+
+    Returns:
+        dict: Diccionario con las claves:
+            - 'inicio' (str): Fecha y hora de inicio de la ejecución en formato ISO.
+            - 'duracion_s' (float): Segundos transcurridos desde el inicio de la ejecución.
+            - 'contadores' (dict): Valor de cada contador.
+            - 'etapas' (dict): Llamadas, errores y latencias (total, media, mínima, máxima) por etapa.
+            - 'caches' (dict): Aciertos, fallos y tasa de aciertos de cada caché.
+    """
+    with _lock:
+        etapas = {
+            etapa: {
+                "llamadas": hist["count"],
+                "errores": hist["errores"],
+                "total_s": hist["sum"],
+                "media_s": hist["sum"] / hist["count"],
+                "min_s": hist["min"],
+                "max_s": hist["max"],
+                "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], hist["buckets"])),
+            }
+            for etapa, hist in _histogramas.items()
+        }
+        caches = {}
+        for nombre, cache in _caches.items():
+            total = cache["aciertos"] + cache["fallos"]
+            caches[nombre] = dict(cache, tasa_aciertos=cache["aciertos"] / total if total else None)
+        return {
+            "inicio": datetime.fromtimestamp(_estado["inicio"]).isoformat(),
+            "duracion_s": time.time() - _estado["inicio"],
+            "contadores": dict(_contadores),
+            "etapas": etapas,
+            "caches": caches,
+        }
+
+
+def exportar_json(ruta):
+    """Guarda el resumen de métricas de la ejecución en un archivo JSON.
+
+    Args:
+        ruta (str): Ruta del archivo de salida.
+
+    Returns:
+        dict: El resumen guardado (ver `resumen_metricas`).
+    """
+    resumen = resumen_metricas()
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resumen, f, indent=2, ensure_ascii=False)
+    return resumen
+
+
+def _nombre_prometheus(nombre):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", nombre)
+
+
+def exportar_prometheus(ruta=None):
+    """Genera las métricas en el formato de texto de Prometheus.
+
+    Args:
+        ruta (str, opcional): Si se indica, el texto también se guarda en este archivo
+            (por ejemplo, para el textfile collector de node_exporter).
+
+    Returns:
+        str: Métricas en formato de texto de Prometheus.
+    """
+    with _lock:
+        lineas = []
+        for nombre, valor in sorted(_contadores.items()):
+            metrica = f"recetas_{_nombre_prometheus(nombre)}_total"
+            lineas += [f"# TYPE {metrica} counter", f"{metrica} {valor}"]
+
+        if _histogramas:
+            lineas.append("# TYPE recetas_etapa_duracion_segundos histogram")
+            for etapa, hist in sorted(_histogramas.items()):
+                acumulado = 0
+                for limite, n in zip([str(b) for b in BUCKETS] + ["+Inf"], hist["buckets"]):
+                    acumulado += n
+                    lineas.append(f'recetas_etapa_duracion_segundos_bucket{{etapa="{etapa}",le="{limite}"}} {acumulado}')
+                lineas.append(f'recetas_etapa_duracion_segundos_sum{{etapa="{etapa}"}} {hist["sum"]}')
+                lineas.append(f'recetas_etapa_duracion_segundos_count{{etapa="{etapa}"}} {hist["count"]}')
+            lineas.append("# TYPE recetas_etapa_errores_total counter")
+            for etapa, hist in sorted(_histogramas.items()):
+                lineas.append(f'recetas_etapa_errores_total{{etapa="{etapa}"}} {hist["errores"]}')
+
+        if _caches:
+            lineas.append("# TYPE recetas_cache_accesos_total counter")
+            for nombre, cache in sorted(_caches.items()):
+                lineas.append(f'recetas_cache_accesos_total{{cache="{nombre}",resultado="acierto"}} {cache["aciertos"]}')
+                lineas.append(f'recetas_cache_accesos_total{{cache="{nombre}",resultado="fallo"}} {cache["fallos"]}')
+
+    texto = "\n".join(lineas) + "\n"
+    if ruta is not None:
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(texto)
+    return texto
@@ -1,5 +1,6 @@
 import pandas as pd
 import psycopg2
+from src.metricas import medir, contar
 
 def establecer_conn(database_name, postgres_pass, usuario, host="localhost"):
     """
@@ -63,6 +64,7 @@ def crear_db(database_name):
     conn.close()
 
 
+@medir("query_fetch")
 def query_fetch(connection, query_text):
     """Ejecuta una consulta SQL y retorna todos los resultados.
 
@@ -77,11 +79,13 @@ def query_fetch(connection, query_text):
     cursor = connection.cursor()
     cursor.execute(query_text)
     result = cursor.fetchall()
+    contar("query_filas_leidas", len(result))
     cursor.close()
     connection.close()
     return result
 
 
+@medir("query_commit")
 def query_commit(connection, query_text, *valores):
     """Ejecuta una consulta SQL de modificación y confirma los cambios en la base de datos.
 
@@ -96,12 +100,14 @@ def query_commit(connection, query_text, *valores):
     """
     cursor = connection.cursor()
     cursor.execute(query_text, *valores)
+    contar("query_filas_escritas", max(cursor.rowcount, 0))
     connection.commit()
     cursor.close()
     connection.close()
     return print("Done!")
 
 
+@medir("query_commit_many")
 def query_commit_many(connection, query_text, *valores):
     """Ejecuta una consulta SQL de modificación para múltiples registros y confirma los cambios.
 
@@ -116,6 +122,7 @@ def query_commit_many(connection, query_text, *valores):
     """
     cursor = connection.cursor()
     cursor.executemany(query_text, *valores)
+    contar("query_filas_escritas", max(cursor.rowcount, 0))
     connection.commit()
     cursor.close()
     connection.close()